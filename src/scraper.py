@@ -1,38 +1,56 @@
 import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from scraper_utils import (
     clean_header,
     extract_related_rubrics,
     fetch_html,
+    fragment_text,
     group_by_page,
     is_decorative,
+    iter_page_groups,
+    iterparse_chapter,
     load_and_normalize_html,
-    parse_directory,
-    parse_remedy_list,
+    load_local_html,
+    log_level,
+    parse_remedy_section,
     save_chapter,
 )
 
-logging.basicConfig(level=logging.DEBUG, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+logging.basicConfig(
+    level=log_level(),
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+_PARAGRAPHS = SoupStrainer("p")
+
 
+def parse_chapter(html, page_info=None, lazy_pages=False):
+    """
+    Parse a chapter's HTML into a Chapter entity.
 
-def parse_chapter(html, page_info=None):
-    soup = BeautifulSoup(html, "lxml")
+    With lazy_pages=True, chapter["pages"] is a generator of page groups rather than a
+    list, so that save_chapter can write each page before the next one is merged.
+    """
+    # Chapters with a <dir> are stream-parsed; only flat <p> chapters need a BeautifulSoup tree.
+    title, rubrics = iterparse_chapter(html)
     chapter = {}
-    title_tag = soup.find("title")
-    chapter_title = title_tag.get_text(strip=True) if title_tag else "No title found"
+    chapter_title = title if title is not None else "No title found"
     chapter["title"] = chapter_title
     logging.info(f"Chapter title: {chapter_title}")
     if page_info:
         chapter["page_info"] = page_info
 
-    if soup.find("dir"):
-        rubrics = parse_directory(soup.find("dir"))
-        logging.debug(f"Parsed {len(rubrics)} rubrics using nested <dir>.")
+    if rubrics is not None:
+        logging.debug("Parsed %d rubrics using nested <dir>.", len(rubrics))
     else:
+        # Only the <p> tags (with their content) are needed, so nothing else is built.
+        soup = BeautifulSoup(html, "lxml", parse_only=_PARAGRAPHS)
         rubrics = []
         paragraphs = soup.find_all("p")
         current_rubric = None
@@ -41,11 +59,10 @@ def parse_chapter(html, page_info=None):
             if is_decorative(raw):
                 continue
             if ":" in raw:
-                header_raw, remedy_raw = raw.split(":", 1)
-                header_text = BeautifulSoup(header_raw, "lxml").get_text(strip=True)
-                header_clean = clean_header(header_text)
-                description = BeautifulSoup(remedy_raw, "lxml").get_text(" ", strip=True)
-                remedies = parse_remedy_list(remedy_raw)
+                header_raw, _, remedy_raw = raw.partition(":")
+                header_clean = sys.intern(clean_header(fragment_text(header_raw)))
+                # One parse of the remedy HTML gives both the description and the remedies.
+                description, remedies = parse_remedy_section(remedy_raw)
                 related = extract_related_rubrics(header_raw)
                 current_rubric = {
                     "title": header_clean,
@@ -55,9 +72,8 @@ def parse_chapter(html, page_info=None):
                     "subrubrics": [],
                 }
             else:
-                header_text = BeautifulSoup(raw, "lxml").get_text(strip=True)
                 current_rubric = {
-                    "title": clean_header(header_text),
+                    "title": sys.intern(clean_header(fragment_text(raw))),
                     "related_rubrics": extract_related_rubrics(raw),
                     "remedies": [],
                     "description": "",
@@ -65,15 +81,38 @@ def parse_chapter(html, page_info=None):
                 }
             if current_rubric:
                 rubrics.append(current_rubric)
-        logging.debug(f"Parsed {len(rubrics)} rubrics using <p> tags.")
+        logging.debug("Parsed %d rubrics using <p> tags.", len(rubrics))
 
-    pages = group_by_page(rubrics, subject_keyword="MIND")
-    chapter["pages"] = pages
+    if lazy_pages:
+        chapter["pages"] = iter_page_groups(rubrics, subject_keyword="MIND")
+    else:
+        chapter["pages"] = group_by_page(rubrics, subject_keyword="MIND")
     chapter["subject"] = "MIND"
     chapter["section"] = "MIND"
     return chapter
 
 
+def _parse_local_chapter(path, page_info=None):
+    return parse_chapter(load_local_html(path), page_info)
+
+
+def parse_local_chapters(paths, page_info=None, max_workers=None, min_parallel=4):
+    """
+    Parse several local chapter files, in order, spreading them over a process pool.
+
+    Chapters are independent and parsing is CPU-bound, so each file is parsed in its own
+    worker process. Fewer than min_parallel files are parsed in this process, where the
+    pool start-up and pickling would cost more than they save.
+    """
+    paths = list(paths)
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+    if len(paths) < min_parallel or max_workers < 2:
+        return [_parse_local_chapter(path, page_info) for path in paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_parse_local_chapter, paths, [page_info] * len(paths)))
+
+
 def main():
     if len(sys.argv) > 1:
         url = sys.argv[1]
@@ -88,7 +127,7 @@ def main():
         logging.info(f"No URL provided. Using local file: {local_path}")
         html_content = load_and_normalize_html(local_path)
     page_info = {"pages_covered": "p. 1-5"}
-    chapter_entity = parse_chapter(html_content, page_info)
+    chapter_entity = parse_chapter(html_content, page_info, lazy_pages=True)
     save_chapter(chapter_entity)
 
 
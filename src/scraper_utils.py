@@ -1,62 +1,101 @@
+import functools
 import json
 import logging
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from text_utils import clean_filename, clean_header, find_parenthesized, is_decorative, normalize_subject_title
 from transformer_utils import prune_empty_keys
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is used without it.
+    orjson = None
+
+
+def log_level():
+    """The logging level named by LOG_LEVEL (e.g. LOG_LEVEL=DEBUG), or INFO if it is unset or unknown."""
+    level = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
 logging.basicConfig(
-    level=logging.DEBUG,  # For detailed logging
+    level=log_level(),
     format="%(asctime)s [%(levelname)s] %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 logger = logging.getLogger(__name__)
 
+# One pooled session for every fetch, so consecutive pages from the same host reuse
+# the TCP/TLS connection; transient connection errors and 5xx responses are retried.
+# Once retries run out, the last 5xx response is returned so that raise_for_status()
+# still raises requests.HTTPError, as it did before retries were added.
+_FETCH_TIMEOUT = 30
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504), raise_on_status=False),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# One parser instance, reused for every HTML fragment instead of letting each
+# BeautifulSoup(...) call build a fresh libxml2 parser context.
+_HTML_PARSER = etree.HTMLParser(recover=True)
+
+# Remedy grades by font colour: red is bold (3), blue is italic (2).
+_FONT_FORMATTING = {"#ff0000": "red", "#0000ff": "blue"}
+
 
 def fetch_html(url):
     logger.info(f"Fetching HTML from URL: {url}")
-    response = requests.get(url)
+    response = _SESSION.get(url, timeout=_FETCH_TIMEOUT)
     response.raise_for_status()
+    # Kent pages are windows-1252, as the local copies are read. Unless the server names a
+    # charset, decode them as such rather than letting requests guess from the content.
+    if "charset=" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = "windows-1252"
     return response.text
 
 
-def load_local_html(filepath):
-    logger.info(f"Loading local HTML file: {filepath}")
-    with open(filepath, "r", encoding="windows-1252") as file:
-        return file.read()
-
+def fetch_html_many(urls, max_workers=8):
+    """
+    Fetch several pages concurrently, returning their HTML in the order of urls.
 
-def load_and_normalize_html(filepath):
-    """Load and normalize HTML using html5lib."""
-    with open(filepath, "r", encoding="windows-1252") as file:
-        raw_html = file.read()
-    soup = BeautifulSoup(raw_html, "html5lib")
-    return str(soup)
+    Fetching is I/O-bound, so threads overlap the requests while sharing the pooled session.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fetch_html, urls))
 
 
-def is_decorative(text):
-    stripped = text.strip()
-    if not stripped:
-        return True
-    if all(char in "- " for char in stripped):
-        return True
-    if ">>>" in stripped:
-        return True
-    if re.match(r"^[->]+$", stripped):
-        return True
-    return False
+def _read_windows_1252(filepath):
+    """Read a windows-1252 text file with one read and one decode, translating newlines as text mode does."""
+    text = Path(filepath).read_bytes().decode("windows-1252")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
-def remove_parentheses(text):
-    return re.sub(r"\([^)]*\)", "", text)
+def load_local_html(filepath):
+    logger.info(f"Loading local HTML file: {filepath}")
+    return _read_windows_1252(filepath)
 
 
-def normalize_subject_title(title):
-    normalized = re.sub(r"\s*p\.?\s*\d+", "", title, flags=re.IGNORECASE)
-    return normalized.strip()
+def load_and_normalize_html(filepath):
+    """Load HTML and normalize it by a round trip through lxml's HTML parser."""
+    raw_html = _read_windows_1252(filepath)
+    return etree.tostring(etree.HTML(raw_html, _HTML_PARSER), encoding="unicode", method="html")
 
 
 def extract_related_rubrics(header):
@@ -64,12 +103,12 @@ def extract_related_rubrics(header):
     Extracts the content inside parentheses from the header, removes HTML tags, strips
     any leading "See", and returns a list of related rubric names.
     """
-    match = re.search(r"\(([^)]*)\)", header)
-    if match:
+    parenthesized = find_parenthesized(header)
+    if parenthesized is not None:
         # Get the raw content inside the parentheses.
-        raw_content = match.group(1).strip()
-        # Use BeautifulSoup to remove any HTML tags.
-        cleaned_text = BeautifulSoup(raw_content, "lxml").get_text(strip=True)
+        raw_content = parenthesized.strip()
+        # Remove any HTML tags; text without tags or entities is used as it is.
+        cleaned_text = fragment_text(raw_content)
         # Remove a leading "See" if present.
         if cleaned_text.lower().startswith("see"):
             cleaned_text = cleaned_text[3:].strip()
@@ -79,54 +118,138 @@ def extract_related_rubrics(header):
     return []
 
 
-def clean_header(header):
-    cleaned = re.sub(r"\s*\([^)]*\)", "", header)
-    return cleaned.strip()
-
-
 def merge_duplicate_rubrics(rubrics):
+    """
+    Merge rubrics whose titles match case-insensitively, keeping first-seen order.
+
+    Merged rubrics are new dictionaries; the input rubrics and their lists are not modified.
+    """
+    # Per title key: the first title, then related rubrics and remedies as dicts (which
+    # keep each key at its first position, so duplicates collapse without reordering),
+    # descriptions and subrubrics, all accumulated in a single pass.
     merged = {}
-    order = []
     for rub in rubrics:
-        rub.setdefault("description", "")
-        rub.setdefault("remedies", [])
-        rub.setdefault("subrubrics", [])
-        rub.setdefault("related_rubrics", [])
-        title = rub.get("title", "").strip()
-        key = title.lower()
-        if key in merged:
-            merged[key]["description"] += " " + rub.get("description", "")
-            merged[key]["remedies"].extend(rub.get("remedies", []))
-            merged[key]["subrubrics"].extend(rub.get("subrubrics", []))
-            merged[key]["related_rubrics"].extend(rub.get("related_rubrics", []))
+        key = rub.get("title", "").strip().lower()
+        parts = merged.get(key)
+        if parts is None:
+            parts = merged[key] = (rub.get("title", ""), {}, {}, [], [])
+        _, related, remedies, descriptions, subrubrics = parts
+        related.update(dict.fromkeys(rub.get("related_rubrics", [])))
+        for remedy in rub.get("remedies", []):
+            remedies.setdefault((remedy.get("name"), remedy.get("grade")), remedy)
+        descriptions.append(rub.get("description", ""))
+        subrubrics.extend(rub.get("subrubrics", []))
+    result = [
+        {
+            "title": title,
+            "related_rubrics": list(related),
+            "remedies": list(remedies.values()),
+            "description": " ".join(descriptions).strip(),
+            "subrubrics": subrubrics,
+        }
+        for title, related, remedies, descriptions, subrubrics in merged.values()
+    ]
+    logger.debug("Merged rubrics: %s", result)
+    return result
+
+
+def _add_paragraph(raw, has_bold, rubrics, current_rubric, element=None):
+    """
+    Apply one <p> of a <dir>, given its inner HTML, to that directory's rubrics.
+
+    Finished rubrics are appended to rubrics. Returns the rubric that is still open
+    afterwards, to which detail paragraphs and nested <dir> tags are attached.
+    When the <p> is also given as an lxml element, its text is read from the element
+    instead of re-parsing pieces of raw. Titles are interned, since subrubric titles
+    such as "morning" or "night" recur throughout a chapter.
+    """
+    if is_decorative(raw):
+        logger.debug("Skipping decorative content.")
+        return current_rubric
+
+    logger.debug("Processing raw <p> content: %s", raw)
+
+    has_colon = ":" in raw
+    # Related rubrics of a paragraph without a colon are kept for its header below.
+    related = [] if has_colon else extract_related_rubrics(raw)
+    # NEW: Use colon check in addition to <b> tag and parentheses.
+    if has_colon or has_bold or related:
+        # Finish the previous rubric if any.
+        if current_rubric and not is_decorative(current_rubric["title"]):
+            rubrics.append(current_rubric)
+
+        if has_colon:
+            header_raw, _, remedy_raw = raw.partition(":")
+            # Extract related rubrics from header_raw before cleaning.
+            related = extract_related_rubrics(header_raw)
+            sections = _split_at_colon(element, raw.count(":")) if element is not None else None
+            if sections is None:
+                header_text = fragment_text(header_raw)
+            else:
+                header_text, description, remedies = sections
+            header_clean = sys.intern(clean_header(header_text))
+            if is_decorative(header_clean):
+                logger.debug("Header '%s' is decorative; skipping.", header_clean)
+                return None
+            if sections is None:
+                description, remedies = parse_remedy_section(remedy_raw)
+            current_rubric = {
+                "title": header_clean,
+                "related_rubrics": related,
+                "remedies": remedies,
+                "description": description,
+                "subrubrics": [],
+            }
         else:
-            merged[key] = rub.copy()
-            order.append(key)
-    for key in merged:
-        merged[key]["description"] = merged[key]["description"].strip()
-        unique_remedies = []
-        seen = set()
-        for remedy in merged[key]["remedies"]:
-            remedy_key = (remedy.get("name"), remedy.get("grade"))
-            if remedy_key not in seen:
-                seen.add(remedy_key)
-                unique_remedies.append(remedy)
-        merged[key]["remedies"] = unique_remedies
-        # Deduplicate related_rubrics preserving order.
-        unique_related = []
-        seen_related = set()
-        for rel in merged[key]["related_rubrics"]:
-            if rel not in seen_related:
-                seen_related.add(rel)
-                unique_related.append(rel)
-        merged[key]["related_rubrics"] = unique_related
-    logger.debug(f"Merged rubrics: {merged}")
-    return [merged[k] for k in order]
+            header_text = _text_content(element) if element is not None else fragment_text(raw)
+            header_clean = sys.intern(clean_header(header_text))
+            if is_decorative(header_clean):
+                logger.debug("Header '%s' is decorative; skipping.", header_clean)
+                return None
+            current_rubric = {
+                "title": header_clean,
+                "related_rubrics": related,
+                "remedies": [],
+                "description": "",
+                "subrubrics": [],
+            }
+        logger.debug("Created rubric: title='%s'", current_rubric["title"])
+        logger.debug("related_rubrics=%s", current_rubric["related_rubrics"])
+    else:
+        # No colon and no header indicator; treat this <p> as additional detail.
+        additional = _text_content(element, " ") if element is not None else fragment_text(raw, " ")
+        if additional and not is_decorative(additional):
+            if current_rubric:
+                current_rubric["description"] += " " + additional
+            else:
+                current_rubric = {
+                    "title": additional,
+                    "related_rubrics": [],
+                    "remedies": [],
+                    "description": "",
+                    "subrubrics": [],
+                }
+    return current_rubric
+
+
+def _close_directory(rubrics, current_rubric):
+    """Finish a <dir>'s open rubric and return the directory's rubrics."""
+    if current_rubric and not is_decorative(current_rubric["title"]):
+        rubrics.append(current_rubric)
+    return rubrics
+
+
+def _attach_subrubrics(subrubrics, rubrics, current_rubric):
+    """Attach a nested <dir>'s rubrics to the open rubric of its parent, or to the parent itself."""
+    if current_rubric:
+        current_rubric["subrubrics"].extend(subrubrics)
+    else:
+        rubrics.extend(subrubrics)
 
 
 def parse_directory(tag, level=0):
     """
-    Recursively parse a <dir> tag to extract rubrics in a hierarchical structure.
+    Parse a <dir> tag to extract rubrics in a hierarchical structure.
 
     Each rubric is represented as a dictionary with keys:
       - title: Cleaned rubric title (parenthesized content removed)
@@ -138,131 +261,214 @@ def parse_directory(tag, level=0):
     A <p> is treated as a rubric header if it contains a colon, a <b> element,
     or if it contains parentheses (triggering extraction of related rubrics).
     Decorative entries (e.g. "---------->>>>>") are skipped.
+
+    Nested <dir> tags are walked with an explicit stack rather than recursion, so
+    deeply nested input cannot hit the interpreter's recursion limit. level is ignored;
+    it is only accepted so that callers of the former recursive version keep working.
+    """
+    return list(iter_directory(tag))
+
+
+def iter_directory(tag):
+    """
+    Yield the rubrics parse_directory(tag) returns, each one as soon as it is complete.
+
+    A top-level rubric is complete once the next header starts or the <dir> ends, so
+    callers can consume a directory's rubrics without waiting for the whole list.
     """
+    # Each stack entry holds the state of an enclosing <dir> while a nested one is parsed.
+    stack = []
+    children = iter(tag.children)
     rubrics = []
     current_rubric = None
 
-    for child in tag.children:
-        if isinstance(child, Tag):
+    while True:
+        child = next(children, None)
+        if child is None:
+            subrubrics = _close_directory(rubrics, current_rubric)
+            if not stack:
+                yield from subrubrics
+                return
+            children, rubrics, current_rubric = stack.pop()
+            _attach_subrubrics(subrubrics, rubrics, current_rubric)
+        elif isinstance(child, Tag):
             if child.name == "p":
                 raw = child.decode_contents()
-                if is_decorative(raw):
-                    logger.debug("Skipping decorative content.")
-                    continue
-
-                logger.debug(f"Processing raw <p> content: {raw}")
-
-                # NEW: Use colon check in addition to <b> tag and parentheses.
-                if ":" in raw or child.find("b") or (len(extract_related_rubrics(raw)) > 0):
-                    # Finish the previous rubric if any.
-                    if current_rubric:
-                        if not is_decorative(current_rubric["title"]):
-                            rubrics.append(current_rubric)
-                        current_rubric = None
-
-                    if ":" in raw:
-                        header_raw, remedy_raw = raw.split(":", 1)
-                        # Extract related rubrics from header_raw before cleaning.
-                        related = extract_related_rubrics(header_raw)
-                        header_text = BeautifulSoup(header_raw, "lxml").get_text(strip=True)
-                        header_clean = clean_header(header_text)
-                        if is_decorative(header_clean):
-                            logger.debug(f"Header '{header_clean}' is decorative; skipping.")
-                            current_rubric = None
-                            continue
-                        description = BeautifulSoup(remedy_raw, "lxml").get_text(" ", strip=True)
-                        remedies = parse_remedy_list(remedy_raw)
-                        current_rubric = {
-                            "title": header_clean,
-                            "related_rubrics": related,
-                            "remedies": remedies,
-                            "description": description,
-                            "subrubrics": [],
-                        }
-                    else:
-                        header_text = BeautifulSoup(raw, "lxml").get_text(strip=True)
-                        header_clean = clean_header(header_text)
-                        if is_decorative(header_clean):
-                            logger.debug(f"Header '{header_clean}' is decorative; skipping.")
-                            current_rubric = None
-                            continue
-                        related = extract_related_rubrics(raw)
-                        current_rubric = {
-                            "title": header_clean,
-                            "related_rubrics": related,
-                            "remedies": [],
-                            "description": "",
-                            "subrubrics": [],
-                        }
-                    logger.debug(f"Created rubric: title='{current_rubric['title']}'")
-                    logger.debug(f"related_rubrics={current_rubric['related_rubrics']}")
-                else:
-                    # No colon and no header indicator; treat this <p> as additional detail.
-                    additional = BeautifulSoup(raw, "lxml").get_text(" ", strip=True)
-                    if additional and not is_decorative(additional):
-                        if current_rubric:
-                            current_rubric["description"] += " " + additional
-                        else:
-                            current_rubric = {
-                                "title": additional,
-                                "related_rubrics": [],
-                                "remedies": [],
-                                "description": "",
-                                "subrubrics": [],
-                            }
+                # Tag names are serialized in lower case and literal "<" in text as "&lt;".
+                has_bold = "<b>" in raw or "<b " in raw
+                current_rubric = _add_paragraph(raw, has_bold, rubrics, current_rubric)
             elif child.name == "dir":
-                subrubrics = parse_directory(child, level + 1)
-                if current_rubric:
-                    current_rubric["subrubrics"].extend(subrubrics)
+                stack.append((children, rubrics, current_rubric))
+                children = iter(child.children)
+                rubrics = []
+                current_rubric = None
+        if not stack and rubrics:
+            yield from rubrics
+            rubrics.clear()
+
+
+def _inner_html(element):
+    """Serialize an lxml element's content the way BeautifulSoup's decode_contents() does."""
+    children = "".join(etree.tostring(child, encoding="unicode", method="html") for child in element)
+    return escape(element.text or "") + children
+
+
+def iterparse_chapter(html, chunk_size=1 << 16):
+    """
+    Stream-parse a chapter's HTML into its title and the rubrics of its first <dir>.
+
+    Returns the same values as BeautifulSoup(html, "lxml").find("title").get_text(strip=True)
+    and parse_directory(...find("dir")), or None for either one that is missing, without
+    building a BeautifulSoup tree. The document is fed to an lxml pull parser in chunks,
+    each <p> is cleared once it has been read, and feeding stops as soon as the title and
+    the first <dir> are complete.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"), tag=("title", "dir", "p"))
+    title = None
+    rubrics = None
+    # The <dir> elements being walked, with the same per-directory state as parse_directory.
+    directories = []
+    stack = []
+    current_rubrics = []
+    current_rubric = None
+
+    for event, element in _pull_events(parser, html, chunk_size):
+        if element.tag == "title":
+            if event == "end" and title is None:
+                title = _text_content(element)
+        elif rubrics is not None:
+            continue
+        elif element.tag == "dir":
+            if event == "start" and (not directories or element.getparent() is directories[-1]):
+                if directories:
+                    stack.append((current_rubrics, current_rubric))
+                    current_rubrics = []
+                    current_rubric = None
+                directories.append(element)
+            elif event == "end" and directories and element is directories[-1]:
+                directories.pop()
+                subrubrics = _close_directory(current_rubrics, current_rubric)
+                if stack:
+                    current_rubrics, current_rubric = stack.pop()
+                    _attach_subrubrics(subrubrics, current_rubrics, current_rubric)
                 else:
-                    rubrics.extend(subrubrics)
-            else:
-                continue
+                    rubrics = subrubrics
+        elif event == "end" and directories and element.getparent() is directories[-1]:
+            has_bold = element.find(".//b") is not None
+            current_rubric = _add_paragraph(_inner_html(element), has_bold, current_rubrics, current_rubric, element)
+            element.clear(keep_tail=True)
+        if title is not None and rubrics is not None:
+            break
+    return title, rubrics
 
-    if current_rubric and not is_decorative(current_rubric["title"]):
-        rubrics.append(current_rubric)
-    return rubrics
 
+def _pull_events(parser, html, chunk_size):
+    """Feed html to a pull parser chunk by chunk, yielding its events as they become available."""
+    if not html:
+        return
+    for start in range(0, len(html), chunk_size):
+        stop = start + chunk_size
+        parser.feed(html[start:stop])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
 
-def group_by_page(rubrics, subject_keyword="MIND"):
+
+@functools.lru_cache(maxsize=64)
+def _page_pattern(subject_keyword):
+    """Compile the page boundary pattern (e.g. "MIND p. 1") once per subject keyword."""
+    return re.compile(rf"^{re.escape(subject_keyword)}\s*p\.?\s*(\d+)", re.IGNORECASE)
+
+
+def iter_page_groups(rubrics, subject_keyword="MIND"):
     """
-    Group a flat list of rubric dictionaries into page groups based on boundaries.
-    A rubric with title matching "MIND p. X" starts a new page.
-    If no page boundaries are found, create a default page "P1".
-    The resulting page dictionary will have keys:
-      - page: the page marker (e.g., "P1")
-      - content: the list of merged rubrics.
+    Lazily group a flat list of rubric dictionaries into page groups.
+
+    Yields the same page dictionaries as group_by_page, one at a time, so that a
+    caller can serialize each page before the next one is merged.
     """
-    groups = []
     current_group = None
-    page_pattern = re.compile(rf"^{subject_keyword}\s*p\.?\s*(\d+)", re.IGNORECASE)
+    page_pattern = _page_pattern(subject_keyword)
+    subject_upper = subject_keyword.upper()
     for rub in rubrics:
         title = rub.get("title", "")
         match = page_pattern.match(title)
         if match:
+            if current_group is not None:
+                yield _finish_page_group(current_group)
             page_num = match.group(1)
             current_group = {"page": f"P{page_num}", "rubrics": []}
-            groups.append(current_group)
         else:
-            if normalize_subject_title(title).upper() == subject_keyword.upper():
+            if normalize_subject_title(title).upper() == subject_upper:
                 continue
             if current_group is None:
                 current_group = {"page": "P1", "rubrics": []}
-                groups.append(current_group)
             current_group["rubrics"].append(rub)
+    if current_group is not None:
+        yield _finish_page_group(current_group)
+
+
+def _finish_page_group(group):
     # Rename the key "rubrics" to "content" after merging duplicates.
-    for group in groups:
-        group["content"] = merge_duplicate_rubrics(group["rubrics"])
-        del group["rubrics"]
-    logger.info(f"Grouped into pages: {[g['page'] for g in groups]}")
+    group["content"] = merge_duplicate_rubrics(group["rubrics"])
+    del group["rubrics"]
+    return group
+
+
+def group_by_page(rubrics, subject_keyword="MIND"):
+    """
+    Group a flat list of rubric dictionaries into page groups based on boundaries.
+    A rubric with title matching "MIND p. X" starts a new page.
+    If no page boundaries are found, create a default page "P1".
+    The resulting page dictionary will have keys:
+      - page: the page marker (e.g., "P1")
+      - content: the list of merged rubrics.
+    """
+    groups = list(iter_page_groups(rubrics, subject_keyword))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Grouped into pages: %s", [g["page"] for g in groups])
     return groups
 
 
+def _parse_fragment(html):
+    """Parse an HTML snippet, wrapped in a <div>, with the shared parser."""
+    return etree.HTML(f"<div>{html}</div>", _HTML_PARSER)
+
+
+def _text_content(element, separator=""):
+    """Equivalent of BeautifulSoup's get_text(separator, strip=True) for an lxml element."""
+    return separator.join(text for text in (piece.strip() for piece in element.itertext()) if text)
+
+
+def fragment_text(html, separator=""):
+    """Text of an HTML snippet, as BeautifulSoup(html, "lxml").get_text(separator, strip=True) returns it."""
+    if _is_plain_text(html):
+        return html.strip()
+    return _text_content(_parse_fragment(html), separator)
+
+
+def parse_remedy_section(remedy_html):
+    """The description and remedy list of the part of a rubric after its colon, from a single parse."""
+    if _is_plain_text(remedy_html):
+        return remedy_html.strip(), parse_remedy_list(remedy_html)
+    root = _parse_fragment(remedy_html)
+    return _text_content(root, " "), _remedies_from_text(_iter_formatted_text(root))
+
+
+def _is_plain_text(html):
+    """True when html has no tags or entities, so parsing it would return it unchanged."""
+    return "<" not in html and "&" not in html
+
+
 def parse_remedy(remedy_snippet):
-    wrapped = f"<div>{remedy_snippet}</div>"
-    frag = BeautifulSoup(wrapped, "lxml")
+    # Most remedies are unformatted text; those need no parse to be graded.
+    if _is_plain_text(remedy_snippet):
+        name = sys.intern(remedy_snippet.strip())
+        logger.debug("Parsed remedy: %s, grade: 1", name)
+        return {"name": name, "grade": 1}
+    frag = _parse_fragment(remedy_snippet)
     grade = 1
-    for font in frag.find_all("font"):
+    for font in frag.iter("font"):
         color = font.get("color", "").lower()
         if color == "#ff0000":
             grade = 3
@@ -270,35 +476,229 @@ def parse_remedy(remedy_snippet):
         elif color == "#0000ff":
             grade = max(grade, 2)
     if grade == 1:
-        if frag.find("b"):
+        if frag.find(".//b") is not None:
             grade = 3
-        elif frag.find("i"):
+        elif frag.find(".//i") is not None:
             grade = 2
-    name = frag.get_text(strip=True)
-    logger.debug(f"Parsed remedy: {name}, grade: {grade}")
+    name = sys.intern(_text_content(frag))
+    logger.debug("Parsed remedy: %s, grade: %s", name, grade)
     return {"name": name, "grade": grade}
 
 
+def _formatting(element):
+    """The remedy formatting an element applies to its text, if any."""
+    if element.tag == "font":
+        return _FONT_FORMATTING.get(element.get("color", "").lower())
+    if element.tag in ("b", "i"):
+        return element.tag
+    return None
+
+
+def _iter_formatted_text(root):
+    """Yield (text, formatting) for every text node under root, in document order."""
+    enclosing = []
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        is_tag = isinstance(element.tag, str)
+        if event == "start":
+            enclosing.append(_formatting(element) if is_tag else None)
+            if is_tag and element.text:
+                yield element.text, {f for f in enclosing if f}
+        else:
+            enclosing.pop()
+            if element.tail and element is not root:
+                yield element.tail, {f for f in enclosing if f}
+
+
+def _split_at_colon(root, colons):
+    """
+    Header text, description and remedies of an element whose text contains a colon.
+
+    The results match parsing the element's HTML on either side of its first colon
+    separately: elements still open at the colon do not format the text after it.
+    colons is the number of colons in the element's HTML; None is returned when its
+    text has a different number, since the first colon of each would then differ
+    (e.g. a colon in an attribute value).
+    """
+    header = []
+    pieces = []
+    enclosing = []
+    found = 0
+    # The number of enclosing elements, opened before the colon, that are still open.
+    open_at_colon = None
+    # Whether the last piece is still adjacent to the next text. The end tag of an element
+    # opened before the colon is dropped when the text after it is parsed on its own, so
+    # the text on either side of that tag forms a single text node.
+    adjacent = False
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        is_tag = isinstance(element.tag, str)
+        if event == "start":
+            enclosing.append(_formatting(element) if is_tag else None)
+            adjacent = False
+            text = element.text if is_tag else None
+        else:
+            enclosing.pop()
+            if open_at_colon is not None and len(enclosing) < open_at_colon:
+                open_at_colon = len(enclosing)
+            else:
+                adjacent = False
+            text = element.tail if element is not root else None
+        if not text:
+            continue
+        found += text.count(":")
+        if open_at_colon is None:
+            before, colon, text = text.partition(":")
+            header.append(before.strip())
+            if not colon:
+                continue
+            open_at_colon = len(enclosing)
+        if adjacent:
+            previous, formatting = pieces.pop()
+            pieces.append((previous + text, formatting))
+        else:
+            pieces.append((text, {f for f in enclosing[open_at_colon:] if f}))
+        adjacent = True
+    if found != colons:
+        return None
+    description = " ".join(text for text in (text.strip() for text, _ in pieces) if text)
+    return "".join(header), description, _remedies_from_text(pieces)
+
+
+def _grade(formatting):
+    # Font colour takes precedence over <b>/<i>, as in parse_remedy.
+    if "red" in formatting:
+        return 3
+    if "blue" in formatting:
+        return 2
+    if "b" in formatting:
+        return 3
+    if "i" in formatting:
+        return 2
+    return 1
+
+
 def parse_remedy_list(remedy_html):
-    remedy_parts = remedy_html.split(",")
-    remedies = [parse_remedy(part) for part in remedy_parts if part.strip()]
+    """
+    Parse a comma-separated remedy list with a single HTML parse.
+
+    Text is split on commas in document order; each remedy is graded by the
+    <font>, <b> and <i> elements enclosing its (non-blank) text. Remedy names are
+    interned, since the same few hundred abbreviations recur throughout the repertory.
+    """
+    if _is_plain_text(remedy_html):
+        return [
+            {"name": sys.intern(name), "grade": 1}
+            for name in (piece.strip() for piece in remedy_html.split(","))
+            if name
+        ]
+    return _remedies_from_text(_iter_formatted_text(_parse_fragment(remedy_html)))
+
+
+def _remedies_from_text(formatted_text):
+    """The remedy list of (text, formatting) pieces in document order; see parse_remedy_list."""
+    remedies = []
+    name_parts = []
+    formatting = set()
+    for text, enclosing in formatted_text:
+        for index, piece in enumerate(text.split(",")):
+            if index and name_parts:
+                remedies.append({"name": sys.intern("".join(name_parts)), "grade": _grade(formatting)})
+                name_parts = []
+                formatting = set()
+            piece = piece.strip()
+            if piece:
+                name_parts.append(piece)
+                formatting |= enclosing
+    if name_parts:
+        remedies.append({"name": sys.intern("".join(name_parts)), "grade": _grade(formatting)})
     return remedies
 
 
-def clean_filename(text):
-    text = text.lower()
-    text = re.sub(r"\s+", "_", text)
-    text = re.sub(r"[^a-z0-9_]", "", text)
-    return text
+def _dumps(value, pretty=True):
+    """
+    Encode value as json.dumps(value, indent=2, ensure_ascii=False) does, using orjson when available.
+
+    With pretty=False the encoding is compact, as with separators=(",", ":") instead of indent=2.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
 
 
-def save_chapter(chapter, output_dir="data/processed"):
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    # Prune keys with empty outputs.
-    pruned_chapter = prune_empty_keys(chapter)
-    filename = f"chapter_{clean_filename(chapter.get('title', 'chapter'))}.json"
-    output_path = os.path.join(output_dir, filename)
-    with open(output_path, "w", encoding="utf-8") as outfile:
-        json.dump(pruned_chapter, outfile, indent=2, ensure_ascii=False, sort_keys=False)
+def _dumps_indented(value, level, pretty=True):
+    if not pretty:
+        return _dumps(value, pretty=False)
+    # JSON encoders never emit raw newlines inside strings, so re-indenting the
+    # nested document is a plain replace.
+    return _dumps(value).replace("\n", "\n" + "  " * level)
+
+
+def write_chapter_json(chapter, outfile, pretty=True):
+    """
+    Write a chapter as pruned, indented JSON, encoding one page at a time.
+
+    The output is identical to json.dump(prune_empty_keys(chapter), outfile, indent=2),
+    but chapter["pages"] may be any iterable (e.g. from iter_page_groups), and only one
+    pruned page is held in memory at a time. With pretty=False the JSON is compact, as
+    with separators=(",", ":") instead of indent=2, which is smaller and faster to write.
+    """
+    if pretty:
+        open_object, item_separator, key_separator, close_object = "{\n  ", ",\n  ", ": ", "\n}"
+        open_pages, page_separator, close_pages = "[\n    ", ",\n    ", "\n  ]"
+    else:
+        open_object, item_separator, key_separator, close_object = "{", ",", ":", "}"
+        open_pages, page_separator, close_pages = "[", ",", "]"
+    written = 0
+    for key, value in chapter.items():
+        if key.lower() == "description":
+            continue
+        if key == "pages":
+            pages = (prune_empty_keys(page) for page in value if page not in ([], "", {}))
+            page = next(pages, None)
+            if page is None:
+                continue
+            outfile.write(item_separator if written else open_object)
+            outfile.write(f'"pages"{key_separator}{open_pages}{_dumps_indented(page, 2, pretty)}')
+            for page in pages:
+                outfile.write(f"{page_separator}{_dumps_indented(page, 2, pretty)}")
+            outfile.write(close_pages)
+        else:
+            if value in ([], "", {}):
+                continue
+            outfile.write(item_separator if written else open_object)
+            encoded = _dumps_indented(prune_empty_keys(value), 1, pretty)
+            outfile.write(f"{json.dumps(key, ensure_ascii=False)}{key_separator}{encoded}")
+        written += 1
+    outfile.write(close_object if written else "{}")
+
+
+def save_chapter(chapter, output_dir="data/processed", pretty=True):
+    _write_chapter_file(chapter, Path(output_dir), pretty)
+
+
+def save_chapters(chapters, output_dir="data/processed", max_workers=8, pretty=True):
+    """
+    Save several chapters as save_chapter does, writing them from a thread pool.
+
+    The output directory is created once, and file writes overlap because they release
+    the GIL. Chapters should have distinct titles, since each title names its file.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda chapter: _write_chapter_file(chapter, output_dir, pretty), chapters))
+
+
+def _write_chapter_file(chapter, output_dir, pretty=True):
+    output_path = output_dir / f"chapter_{clean_filename(chapter.get('title', 'chapter'))}.json"
+    # The output directory normally exists already; it is only created when opening fails.
+    try:
+        outfile = open(output_path, "w", encoding="utf-8")
+    except FileNotFoundError:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        outfile = open(output_path, "w", encoding="utf-8")
+    # Keys with empty outputs are pruned while writing.
+    with outfile:
+        write_chapter_json(chapter, outfile, pretty)
     logger.info(f"Chapter saved to {output_path}")
@@ -0,0 +1,57 @@
+import functools
+import re
+import string
+
+# Patterns used on every paragraph are compiled once at import.
+_PARENTHESES_RE = re.compile(r"\(([^)]*)\)")
+_HEADER_PARENTHESES_RE = re.compile(r"\s*\([^)]*\)")
+_PAGE_SUFFIX_RE = re.compile(r"\s*p\.?\s*\d+", re.IGNORECASE)
+
+# Deletes every ASCII character that clean_filename does not keep; non-ASCII is dropped separately.
+_FILENAME_ALLOWED = string.ascii_lowercase + string.digits + "_"
+_FILENAME_TABLE = str.maketrans("", "", "".join(chr(c) for c in range(128) if chr(c) not in _FILENAME_ALLOWED))
+
+
+def is_decorative(text):
+    stripped = text.strip()
+    # Empty, only hyphens and spaces, an arrow run, or only hyphens and arrows.
+    return not stripped.strip("- ") or ">>>" in stripped or not stripped.strip("->")
+
+
+def remove_parentheses(text):
+    return _PARENTHESES_RE.sub("", text)
+
+
+def find_parenthesized(text):
+    """The text inside the first pair of parentheses in text, or None if it has none."""
+    # Most headers have no parentheses; those need no regex search.
+    if "(" not in text:
+        return None
+    match = _PARENTHESES_RE.search(text)
+    return match.group(1) if match else None
+
+
+# Page boundary titles ("MIND p. 1", ...) recur across chapters; the result is an immutable str.
+@functools.lru_cache(maxsize=8192)
+def normalize_subject_title(title):
+    normalized = _PAGE_SUFFIX_RE.sub("", title)
+    return normalized.strip()
+
+
+def clean_header(header):
+    if "(" not in header:
+        return header.strip()
+    cleaned = _HEADER_PARENTHESES_RE.sub("", header)
+    return cleaned.strip()
+
+
+def clean_filename(text):
+    """
+    Lower-case text, join whitespace runs with "_" and drop anything outside [a-z0-9_].
+
+    Leading and trailing whitespace is dropped rather than turned into an underscore.
+    """
+    text = "_".join(text.lower().split()).translate(_FILENAME_TABLE)
+    if text.isascii():
+        return text
+    return text.encode("ascii", "ignore").decode("ascii")
@@ -21,15 +21,40 @@ def transform_content(rubrics):
     return transformed
 
 
+# Values dropped by prune_empty_keys; compared with ==, so any empty list, string or dict matches.
+_EMPTY_VALUES = ([], "", {})
+
+
+def _pruned_container(value, stack):
+    """Return an empty copy of a dict or list and queue it for filling; return other values as is."""
+    if isinstance(value, dict):
+        copy = {}
+    elif isinstance(value, list):
+        copy = []
+    else:
+        return value
+    stack.append((value, copy))
+    return copy
+
+
 def prune_empty_keys(data):
     """
     Recursively remove dictionary keys whose values are empty (lists, strings, dicts)
     and also remove any keys named 'description'.
+
+    The nesting is walked with an explicit stack rather than recursion, so deep rubric
+    trees do not hit the recursion limit. A container that only becomes empty after
+    pruning is kept, as before.
     """
-    if isinstance(data, dict):
-        # Skip any key that is 'description'
-        return {k: prune_empty_keys(v) for k, v in data.items() if k.lower() != "description" and v not in ([], "", {})}
-    elif isinstance(data, list):
-        return [prune_empty_keys(item) for item in data if item not in ([], "", {})]
-    else:
-        return data
+    stack = []
+    result = _pruned_container(data, stack)
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                # Skip any key that is 'description'
+                if key.lower() != "description" and value not in _EMPTY_VALUES:
+                    target[key] = _pruned_container(value, stack)
+        else:
+            target.extend(_pruned_container(item, stack) for item in source if item not in _EMPTY_VALUES)
+    return result
@@ -35,3 +35,17 @@ def test_group_by_page_boundaries():
     # For example, the first group should contain "Rubric A" and "Rubric B" (if present)
     # and the next boundary ("VERTIGO p. 101") should start a new group.
     # (You can add further assertions here as needed.)
+
+
+def test_group_by_page_escapes_subject_keyword():
+    from src.scraper_utils import group_by_page
+
+    # Parentheses in the keyword must match literally rather than open a regex group.
+    rubrics = [
+        {"title": "EXTREMITIES (PAIN) p. 7", "remedies": [], "subrubrics": []},
+        {"title": "Rubric A", "remedies": [{"name": "RemedyA", "grade": 1}], "subrubrics": []},
+        {"title": "EXTREMITIES PAIN p. 8", "remedies": [], "subrubrics": []},
+    ]
+    pages = group_by_page(rubrics, subject_keyword="EXTREMITIES (PAIN)")
+    assert [page["page"] for page in pages] == ["P7"], f"Expected a single page P7, got {pages}"
+    assert len(pages[0]["content"]) == 2, f"Expected the unescaped title to stay in the content, got {pages[0]}"
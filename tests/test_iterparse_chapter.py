@@ -0,0 +1,57 @@
+import os
+
+from bs4 import BeautifulSoup
+
+from scraper_utils import iterparse_chapter, load_local_html, parse_directory
+
+
+def _parse_with_soup(html):
+    soup = BeautifulSoup(html, "lxml")
+    return soup.find("title").get_text(strip=True), parse_directory(soup.find("dir"))
+
+
+def test_iterparse_chapter_matches_parse_directory():
+    html = """
+    <html>
+      <head><title>KENT0000</title></head>
+      <body>
+         <dir>
+           <p><b>MIND p. 1</b></p>
+           <p><b>ABSENT-MINDED (See Forsaken): <i><font COLOR="#0000ff">tarent.</font></i>, alum.</b></p>
+           <dir>
+              <p>morning : Guai., nat-c., ph-ac., phos.</p>
+              <p>11 a.m. to 4 p.m. : Kali-n.</p>
+              <b><p>NOT A DIRECT CHILD: ign.</p></b>
+           </dir>
+           <p>Extra detail &amp; more</p>
+           <p>---------->>>>></p>
+         </dir>
+         <dir><p>SECOND DIRECTORY: nux-v.</p></dir>
+      </body>
+    </html>
+    """
+    assert iterparse_chapter(html) == _parse_with_soup(html)
+
+
+def test_iterparse_chapter_colon_edge_cases():
+    # Formatting opened before the colon, text split by its end tag, a colon that only
+    # appears as a character reference, and a colon inside an attribute value.
+    html = """
+    <html><head><title>KENT0000</title></head><body><dir>
+      <p><b>ANGER : acon. </b> , <i>bry.</i>, calc</p>
+      <p><b>ANXIETY : ars.  </b>  (See Fear)</p>
+      <p>COMPANY &#58; desire for, <b>puls.</b></p>
+      <p><a href="http://example.com">CONFUSION</a> : <font COLOR="#ff0000">Nux-v.</font></p>
+    </dir></body></html>
+    """
+    assert iterparse_chapter(html) == _parse_with_soup(html)
+
+
+def test_iterparse_chapter_matches_parse_directory_on_sample_page():
+    html = load_local_html(os.path.join("data", "raw", "kent0000_P1.html"))
+    # Small chunks exercise rubrics whose <p> spans several feeds.
+    assert iterparse_chapter(html, chunk_size=1000) == _parse_with_soup(html)
+
+
+def test_iterparse_chapter_without_dir():
+    assert iterparse_chapter("<html><body><p>ANGER: acon.</p></body></html>") == (None, None)
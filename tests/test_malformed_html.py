@@ -26,3 +26,23 @@ def test_problematic_header_extraction():
     # Since there's no colon, the remedy list and description should be empty.
     assert rubric["remedies"] == [], f"Expected empty remedies list, got {rubric['remedies']}"
     assert rubric["description"] == "", f"Expected empty description, got '{rubric['description']}'"
+
+
+def test_iter_directory_yields_rubrics_as_they_complete():
+    from scraper_utils import iter_directory
+
+    html = """
+    <dir>
+       <p><b>ANGER: acon.</b></p>
+       <dir><p>morning : nux-v.</p></dir>
+       <p><b>ANXIETY: ars.</b></p>
+       <p>EXTRA</p>
+    </dir>
+    """
+    soup = BeautifulSoup(html, "lxml")
+    rubrics = iter_directory(soup.find("dir"))
+    first = next(rubrics)
+    # ANGER is complete, with its subrubric, before the rest of the directory is read.
+    assert first["title"] == "ANGER", f"Expected 'ANGER' first, got '{first['title']}'"
+    assert [sub["title"] for sub in first["subrubrics"]] == ["morning"], f"Unexpected subrubrics: {first}"
+    assert [first] + list(rubrics) == parse_directory(soup.find("dir"))
@@ -2,8 +2,9 @@ from bs4 import BeautifulSoup
 
 from scraper import parse_chapter
 from scraper_utils import (
+    clean_filename,
     clean_header,
-    extract_related_rubrics,
+    find_parenthesized,
     is_decorative,
     merge_duplicate_rubrics,
     normalize_subject_title,
@@ -50,26 +51,27 @@ def test_normalize_subject_title():
 
 
 # ----------------------------
-# Related Rubrics and Header Cleaning Tests
+# Header and Filename Cleaning Tests
 # ----------------------------
 
 
-def test_extract_related_rubrics_single():
+def test_clean_header():
     header = "ABANDONED (See Forsaken)"
-    related = extract_related_rubrics(header)
-    assert related == ["Forsaken"], f"Expected ['Forsaken'], got {related}"
+    cleaned = clean_header(header)
+    assert cleaned == "ABANDONED", f"Expected 'ABANDONED', got '{cleaned}'"
+    assert clean_header("  ANGER, morning ") == "ANGER, morning"
 
 
-def test_extract_related_rubrics_multiple():
-    header = "AFFECTIONATE (See Love, Indifference)"
-    related = extract_related_rubrics(header)
-    assert related == ["Love", "Indifference"], f"Expected ['Love', 'Indifference'], got {related}"
+def test_find_parenthesized():
+    assert find_parenthesized("ABANDONED (See Forsaken) (old)") == "See Forsaken"
+    assert find_parenthesized("ANGER, morning") is None
+    assert find_parenthesized("ANGER (unclosed") is None
 
 
-def test_clean_header():
-    header = "ABANDONED (See Forsaken)"
-    cleaned = clean_header(header)
-    assert cleaned == "ABANDONED", f"Expected 'ABANDONED', got '{cleaned}'"
+def test_clean_filename():
+    assert clean_filename("KENT0000") == "kent0000"
+    assert clean_filename("Mind  p. 1") == "mind_p_1"
+    assert clean_filename("Kent_0005 (Vertigo)\t-\tÉ") == "kent_0005_vertigo__"
 
 
 # ----------------------------
@@ -86,9 +88,8 @@ def test_parse_directory_simple_rubric():
     assert len(rubrics) == 1, f"Expected 1 rubric, got {len(rubrics)}"
     rub = rubrics[0]
     assert rub["title"] == "ABSENT-MINDED", f"Expected title 'ABSENT-MINDED', got '{rub['title']}'"
-    remedy_names = [r["name"] for r in rub["remedies"]]
-    assert "Acon." in remedy_names
-    assert "calc." in remedy_names
+    remedy_names = {r["name"] for r in rub["remedies"]}
+    assert {"Acon.", "calc."} <= remedy_names, f"Expected remedies Acon. and calc., got {rub['remedies']}"
 
 
 # ----------------------------
@@ -156,6 +157,32 @@ def test_parse_remedy_list():
     assert mapping.get("tarent.") == 2
 
 
+def test_parse_remedy_list_formatting_spans_commas():
+    # A single <i><font> run covering several remedies grades every one of them.
+    remedy_html = '<i><font COLOR="#0000ff">alum., am-c.</font>, </i>am-m., <b>Lach.</b>'
+    remedies = parse_remedy_list(remedy_html)
+    assert [(r["name"], r["grade"]) for r in remedies] == [("alum.", 2), ("am-c.", 2), ("am-m.", 1), ("Lach.", 3)]
+
+
+def test_parse_remedy_list_plain_text():
+    # Unformatted lists skip the HTML parse but must split and grade the same way.
+    remedies = parse_remedy_list(" Guai., nat-c., , ph-ac.,")
+    assert remedies == [
+        {"name": "Guai.", "grade": 1},
+        {"name": "nat-c.", "grade": 1},
+        {"name": "ph-ac.", "grade": 1},
+    ], f"Unexpected remedies: {remedies}"
+
+
+def test_parse_remedy_list_interns_names():
+    # Repeated remedies share one string object, whether or not the list was parsed as HTML.
+    plain = parse_remedy_list("calc., " + "sul" + "ph.")
+    formatted = parse_remedy_list("<b>calc.</b>, <i>" + "sul" + "ph.</i>")
+    for a, b in zip(plain, formatted):
+        assert a["name"] is b["name"], f"Expected {a['name']!r} to be interned"
+    assert parse_remedy("<i>calc.</i>")["name"] is plain[0]["name"], "Expected parse_remedy to intern names"
+
+
 # ----------------------------
 # Duplicate Rubric Merging Tests
 # ----------------------------
@@ -177,6 +204,14 @@ def test_merge_duplicate_rubrics():
     assert len(merged_rub["remedies"]) == 1
 
 
+def test_merge_duplicate_rubrics_leaves_input_unchanged():
+    first = {"title": "ANGER", "description": "", "remedies": [{"name": "acon.", "grade": 1}], "subrubrics": []}
+    second = {"title": "anger", "description": "", "remedies": [{"name": "bry.", "grade": 2}], "subrubrics": []}
+    merged = merge_duplicate_rubrics([first, second])
+    assert [r["name"] for r in merged[0]["remedies"]] == ["acon.", "bry."]
+    assert first["remedies"] == [{"name": "acon.", "grade": 1}], "Input rubric remedies were modified"
+
+
 # ----------------------------
 # Test for Excluding Decorative Rubrics
 # ----------------------------
@@ -236,3 +271,24 @@ def test_parse_chapter_schema():
             assert (
                 normalize_subject_title(rub["title"]).upper() != "MIND"
             ), f"Found redundant subject marker '{rub['title']}' in page {page['page']}"
+
+
+def test_parse_chapter_without_dir():
+    # Chapters without a <dir> fall back to reading every <p>, wherever it is in the page.
+    html = """
+    <html>
+      <head><title>KENT0000</title></head>
+      <body>
+         <p>MIND p. 1</p>
+         <table><tr><td><p>ANGER (See Irritability): <b>acon.</b>, bry.</p></td></tr></table>
+         <p>ANXIETY</p>
+      </body>
+    </html>
+    """
+    chapter = parse_chapter(html)
+    assert chapter["title"] == "KENT0000"
+    content = chapter["pages"][0]["content"]
+    assert [rub["title"] for rub in content] == ["ANGER", "ANXIETY"], f"Unexpected rubrics: {content}"
+    assert content[0]["related_rubrics"] == ["Irritability"]
+    assert content[0]["remedies"] == [{"name": "acon.", "grade": 3}, {"name": "bry.", "grade": 1}]
+    assert content[0]["description"] == "acon. , bry.", f"Unexpected description: {content[0]['description']}"
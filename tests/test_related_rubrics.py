@@ -1,6 +1,6 @@
 from bs4 import BeautifulSoup
 
-from scraper_utils import clean_header, extract_related_rubrics, is_decorative, parse_directory
+from scraper_utils import extract_related_rubrics, is_decorative, parse_directory
 
 # ----------------------------
 # Test for related rubrics extraction
@@ -19,10 +19,9 @@ def test_extract_related_rubrics_multiple():
     assert related == ["Love", "Indifference"], f"Expected ['Love', 'Indifference'], got {related}"
 
 
-def test_clean_header():
-    header = "ABANDONED (See Forsaken)"
-    cleaned = clean_header(header)
-    assert cleaned == "ABANDONED", f"Expected 'ABANDONED', got '{cleaned}'"
+def test_extract_related_rubrics_none():
+    related = extract_related_rubrics("ANGER, morning: acon.")
+    assert related == [], f"Expected no related rubrics, got {related}"
 
 
 # ----------------------------
@@ -71,28 +70,6 @@ def test_parse_directory_excludes_decorative():
     ], f"Expected related rubrics ['Forsaken'], got {rubric.get('related_rubrics')}"
 
 
-# ----------------------------
-# Test for decorative rubric not being included at all (via grouping)
-# ----------------------------
-
-
-def test_decorative_rubric_not_included():
-    # This snippet simulates a page boundary followed by a decorative rubric.
-    html = """
-    <dir>
-      <p><b>MIND p. 1</b></p>
-      <p><b>ABSENT-MINDED (See Forsaken): Acon., calc.</b></p>
-      <p><b>---------->>>>> </b></p>
-    </dir>
-    """
-    soup = BeautifulSoup(html, "lxml")
-    rubrics = parse_directory(soup.find("dir"))
-    # When later grouping by page, the decorative rubric should be filtered out.
-    # Here, ensure that none of the rubrics have a title that is purely decorative.
-    for rub in rubrics:
-        assert not is_decorative(rub["title"]), f"Found decorative rubric title: '{rub['title']}'"
-
-
 def test_related_rubrics_extraction_only():
     html = """
     <dir>
@@ -0,0 +1,114 @@
+import io
+import json
+
+import scraper_utils
+from scraper import parse_chapter
+from scraper_utils import save_chapter, save_chapters, write_chapter_json
+from transformer_utils import prune_empty_keys
+
+HTML = """
+<html>
+  <head><title>KENT0000</title></head>
+  <body>
+     <dir>
+       <p><b>MIND p. 1</b></p>
+       <p><b>ABSENT-MINDED (See Forsaken): <i><font COLOR="#0000ff">tarent.</font></i>, alum.</b></p>
+       <dir>
+          <p>morning : Guai., nat-c., ph-ac., phos.</p>
+       </dir>
+       <p><b>MIND p. 2</b></p>
+       <p><b>AMOROUS (See Lewdness): <b><font COLOR="#ff0000">Acon.</b></font>, calc.</b></p>
+       <p>ANGER</p>
+     </dir>
+  </body>
+</html>
+"""
+
+
+def test_write_chapter_json_matches_json_dump():
+    chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"})
+    expected = json.dumps(prune_empty_keys(chapter), indent=2, ensure_ascii=False)
+    outfile = io.StringIO()
+    write_chapter_json(chapter, outfile)
+    assert outfile.getvalue() == expected
+
+
+def test_write_chapter_json_lazy_pages():
+    chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"})
+    lazy_chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"}, lazy_pages=True)
+    assert not isinstance(lazy_chapter["pages"], list), "Expected pages to be a generator"
+    expected = io.StringIO()
+    write_chapter_json(chapter, expected)
+    outfile = io.StringIO()
+    write_chapter_json(lazy_chapter, outfile)
+    assert outfile.getvalue() == expected.getvalue()
+    assert [page["page"] for page in json.loads(outfile.getvalue())["pages"]] == ["P1", "P2"]
+
+
+def test_write_chapter_json_without_pages():
+    outfile = io.StringIO()
+    write_chapter_json({"title": "KENT0000", "pages": iter([]), "description": "dropped"}, outfile)
+    assert json.loads(outfile.getvalue()) == {"title": "KENT0000"}
+
+
+def test_write_chapter_json_without_orjson(monkeypatch):
+    chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"})
+    expected = io.StringIO()
+    write_chapter_json(chapter, expected)
+    monkeypatch.setattr(scraper_utils, "orjson", None)
+    outfile = io.StringIO()
+    write_chapter_json(chapter, outfile)
+    assert outfile.getvalue() == expected.getvalue()
+
+
+def test_save_chapter_creates_nested_output_dir(tmp_path):
+    output_dir = tmp_path / "processed" / "kent"
+    chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"})
+    save_chapter(chapter, output_dir=str(output_dir))
+    save_chapter(chapter, output_dir=str(output_dir))
+    output_path = output_dir / "chapter_kent0000.json"
+    assert output_path.exists(), f"Expected {output_path} to be written"
+    assert json.loads(output_path.read_text(encoding="utf-8"))["title"] == "KENT0000"
+
+
+def test_save_chapters_matches_save_chapter(tmp_path):
+    titles = ["KENT0000", "KENT0005", "KENT0010"]
+    chapters = []
+    for title in titles:
+        chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"})
+        chapter["title"] = title
+        save_chapter(chapter, output_dir=str(tmp_path / "serial"))
+        chapters.append(chapter)
+    save_chapters(chapters, output_dir=str(tmp_path / "batch"), max_workers=2)
+    for title in titles:
+        filename = f"chapter_{title.lower()}.json"
+        expected = (tmp_path / "serial" / filename).read_text(encoding="utf-8")
+        assert (tmp_path / "batch" / filename).read_text(encoding="utf-8") == expected, f"{filename} differs"
+
+
+def test_write_chapter_json_compact(monkeypatch):
+    chapter = parse_chapter(HTML, page_info={"pages_covered": "p. 1-5"})
+    expected = json.dumps(prune_empty_keys(chapter), separators=(",", ":"), ensure_ascii=False)
+    outfile = io.StringIO()
+    write_chapter_json(chapter, outfile, pretty=False)
+    assert outfile.getvalue() == expected
+    monkeypatch.setattr(scraper_utils, "orjson", None)
+    outfile = io.StringIO()
+    write_chapter_json(chapter, outfile, pretty=False)
+    assert outfile.getvalue() == expected
+
+
+def test_prune_empty_keys_deep_nesting():
+    # Deeper than the default recursion limit; the pruned copy keeps containers emptied by pruning.
+    chapter = {"title": "KENT0000", "pages": []}
+    rubric = chapter
+    for depth in range(2000):
+        child = {"title": f"Rubric {depth}", "description": "dropped", "remedies": [], "subrubrics": []}
+        rubric.setdefault("subrubrics", []).append(child)
+        rubric = child
+    rubric["subrubrics"].append({"description": "dropped"})
+    pruned = prune_empty_keys(chapter)
+    assert "pages" not in pruned, f"Expected empty pages to be dropped, got {list(pruned)}"
+    for _ in range(2000):
+        pruned = pruned["subrubrics"][0]
+    assert pruned == {"title": "Rubric 1999", "subrubrics": [{}]}, f"Unexpected innermost rubric {pruned}"
@@ -10,37 +10,146 @@ from src.scraper_utils import load_local_html
 
 
 # We can define a fixture for loading our sample HTML file.
-@pytest.fixture
+# The file and its soup are only read, so they are loaded and parsed once per module.
+@pytest.fixture(scope="module")
 def sample_html():
     filepath = os.path.join("data", "raw", "kent0000_P1.html")
     return load_local_html(filepath)
 
 
-def test_title_extraction(sample_html):
+@pytest.fixture(scope="module")
+def sample_soup(sample_html):
+    return BeautifulSoup(sample_html, "lxml")
+
+
+def test_title_extraction(sample_soup):
     """Test that the title is correctly extracted."""
-    soup = BeautifulSoup(sample_html, "lxml")
-    title_tag = soup.find("title")
+    title_tag = sample_soup.find("title")
     title = title_tag.get_text(strip=True) if title_tag else ""
     assert title == "KENT0000", f"Expected title to be 'KENT0000', got '{title}'"
 
 
-def test_anchor_extraction(sample_html):
+def test_anchor_extraction(sample_soup):
     """Test that named anchors are found and correctly extracted."""
-    soup = BeautifulSoup(sample_html, "lxml")
-    anchors = soup.find_all("a", attrs={"name": True})
-    names = [a.get("name") for a in anchors]
+    anchors = sample_soup.find_all("a", attrs={"name": True})
+    names = {a.get("name") for a in anchors}
 
     expected_names = ["P1", "ABSENTMINDED", "ABSORBED", "P2", "ANGER", "P3", "P4", "ANXIETY", "P5"]
-    for name in expected_names:
-        assert name in names, f"Expected anchor name '{name}' not found."
+    missing = [name for name in expected_names if name not in names]
+    assert not missing, f"Expected anchor names {missing} not found."
 
 
-def test_paragraph_extraction(sample_html):
+def test_paragraph_extraction(sample_soup):
     """Test that a few paragraphs are extracted and not empty."""
-    soup = BeautifulSoup(sample_html, "lxml")
-    paragraphs = soup.find_all("p")
+    paragraphs = sample_soup.find_all("p")
     # Check that the first few paragraphs contain expected text snippets.
     assert paragraphs, "No paragraphs found in the sample HTML."
 
     first_paragraph = paragraphs[0].get_text(strip=True)
     assert "KENT" in first_paragraph, f"Expected 'KENT' in first paragraph, got '{first_paragraph}'"
+
+
+def test_parse_local_chapters_matches_serial_parse():
+    from scraper import parse_chapter, parse_local_chapters
+
+    raw_dir = os.path.join("data", "raw")
+    paths = [os.path.join(raw_dir, name) for name in sorted(os.listdir(raw_dir))[:4]]
+    expected = [parse_chapter(load_local_html(path), {"pages_covered": "p. 1-5"}) for path in paths]
+    chapters = parse_local_chapters(paths, {"pages_covered": "p. 1-5"}, max_workers=2, min_parallel=2)
+    assert chapters == expected, "Expected the process pool to return the serial results in input order"
+
+
+def test_load_and_normalize_html_parses_like_raw_html(sample_html):
+    from scraper import parse_chapter
+    from scraper_utils import load_and_normalize_html
+
+    normalized = load_and_normalize_html(os.path.join("data", "raw", "kent0000_P1.html"))
+    assert parse_chapter(normalized) == parse_chapter(sample_html), "Normalizing should not change the parsed chapter"
+
+
+def test_fetch_html_many_keeps_url_order(monkeypatch):
+    import scraper_utils
+
+    class FakeResponse:
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+
+        def __init__(self, url):
+            self.text = f"<html>{url}</html>"
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr(scraper_utils._SESSION, "get", lambda url, timeout: FakeResponse(url))
+    urls = [f"http://example.com/kent{num:04d}.htm" for num in range(0, 50, 5)]
+    pages = scraper_utils.fetch_html_many(urls, max_workers=4)
+    assert pages == [f"<html>{url}</html>" for url in urls], "Expected one page per URL, in order"
+
+
+def test_fetch_html_decodes_windows_1252_without_charset(monkeypatch):
+    import requests
+
+    import scraper_utils
+
+    def fake_get(url, timeout):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/html"
+        response._content = "<p>Kent’s Repertory</p>".encode("windows-1252")
+        return response
+
+    monkeypatch.setattr(scraper_utils._SESSION, "get", fake_get)
+    html = scraper_utils.fetch_html("http://example.com/kent0000.htm")
+    assert html == "<p>Kent’s Repertory</p>", f"Unexpected decoding: {html!r}"
+
+
+def test_load_local_html_translates_newlines(tmp_path):
+    path = tmp_path / "kent.html"
+    path.write_bytes("<p>Kent’s\r\nRepertory\rp. 1</p>\n".encode("windows-1252"))
+    assert load_local_html(str(path)) == path.read_text(encoding="windows-1252")
+    assert load_local_html(str(path)) == "<p>Kent’s\nRepertory\np. 1</p>\n"
+
+
+def test_log_level_falls_back_to_info(monkeypatch):
+    import logging
+
+    from scraper_utils import log_level
+
+    monkeypatch.setenv("LOG_LEVEL", "debug")
+    assert log_level() == logging.DEBUG
+    monkeypatch.setenv("LOG_LEVEL", "verbose")
+    assert log_level() == logging.INFO, "Expected an unknown LOG_LEVEL to fall back to INFO"
+    monkeypatch.delenv("LOG_LEVEL")
+    assert log_level() == logging.INFO
+
+
+def test_fetch_html_raises_http_error_after_retrying_5xx(monkeypatch):
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    import requests
+
+    import scraper_utils
+
+    requests_seen = []
+
+    class Unavailable(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Unavailable)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Same retry policy, without the back-off sleeps.
+    monkeypatch.setattr(scraper_utils._ADAPTER, "max_retries", scraper_utils._ADAPTER.max_retries.new(backoff_factor=0))
+    try:
+        with pytest.raises(requests.HTTPError):
+            scraper_utils.fetch_html(f"http://127.0.0.1:{server.server_port}/kent0000.htm")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(requests_seen) == 4, f"Expected the first request and 3 retries, got {len(requests_seen)}"